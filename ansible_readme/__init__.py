@@ -2,20 +2,71 @@
 
 __all__ = ['AnsibleReadme']
 
+import json
 import pathlib
 
 import click
 import colorama
 
 from ansible_readme.__version__ import __version__
-from ansible_readme.ansible_readme import AnsibleReadme
-from ansible_readme.logger import should_do_markup
+from ansible_readme.ansible_readme import (
+    DEFAULT_TEMPLATE,
+    AnsibleReadme,
+    generate_roots,
+    lint_roots,
+    load_roots,
+    report_errors,
+)
+from ansible_readme.cache import ReadmeCache
+from ansible_readme.filters import ValueLimits
+from ansible_readme.loader import LoadLimits
+from ansible_readme.logger import errors_only, should_do_markup
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
+DEFAULT_LIMITS = LoadLimits()
+
+DEFAULT_VALUE_LIMITS = ValueLimits()
+
 colorama.init(autoreset=True, strip=not should_do_markup())
 
 
+def _parse_shard(ctx, param, value):
+    """Parse INDEX/COUNT into a tuple of integers."""
+    if value is None:
+        return None
+
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise click.BadParameter('must be INDEX/COUNT, for example 1/4')
+
+    if not 1 <= index <= count:
+        raise click.BadParameter('INDEX must be between 1 and COUNT')
+
+    return index, count
+
+
+jobs_option = click.option(
+    '-j',
+    '--jobs',
+    help='Number of processes loading roles to lint (defaults to CPU count)',
+    default=None,
+    type=click.IntRange(min=1),
+)
+
+shard_option = click.option(
+    '--shard',
+    help=(
+        'Only handle roles in shard INDEX/COUNT (1-based), stable across '
+        'runs and CI nodes'
+    ),
+    default=None,
+    metavar='INDEX/COUNT',
+    callback=_parse_shard,
+)
+
+
 @click.group()
 @click.version_option(version=__version__)
 @click.option(
@@ -24,8 +75,38 @@ colorama.init(autoreset=True, strip=not should_do_markup())
     default=False,
     show_default=True,
 )
+@click.option(
+    '--max-file-size',
+    help='Largest role YAML file to load (bytes)',
+    default=DEFAULT_LIMITS.max_file_size,
+    type=click.IntRange(min=0),
+    show_default=True,
+)
+@click.option(
+    '--max-alias-expansions',
+    help='Most YAML nodes role files may pull in through aliases',
+    default=DEFAULT_LIMITS.max_alias_expansions,
+    type=click.IntRange(min=0),
+    show_default=True,
+)
+@click.option(
+    '--max-depth',
+    help='Deepest nesting allowed in role YAML files',
+    default=DEFAULT_LIMITS.max_depth,
+    type=click.IntRange(min=1),
+    show_default=True,
+)
+@click.option(
+    '--max-parse-time',
+    help='Longest time parsing a single role YAML file may take (seconds)',
+    default=DEFAULT_LIMITS.max_parse_time,
+    type=click.FloatRange(min=0),
+    show_default=True,
+)
 @click.pass_context
-def __main__(ctx, debug):
+def __main__(
+    ctx, debug, max_file_size, max_alias_expansions, max_depth, max_parse_time
+):
     """
     \b
             ___    _   _______ ________  __    ______
@@ -43,12 +124,16 @@ def __main__(ctx, debug):
     """  # noqa
     ctx.obj = {}
     ctx.obj['debug'] = debug
+    ctx.obj['limits'] = LoadLimits(
+        max_file_size=max_file_size,
+        max_alias_expansions=max_alias_expansions,
+        max_depth=max_depth,
+        max_parse_time=max_parse_time,
+    )
 
 
 @__main__.command(context_settings=CONTEXT_SETTINGS)
-@click.argument(
-    'roles-path', type=click.Path(exists=True), default=str(pathlib.Path('.'))
-)
+@click.argument('roles-paths', type=click.Path(exists=True), nargs=-1)
 @click.pass_context
 @click.option(
     '--force/--no-force',
@@ -56,16 +141,25 @@ def __main__(ctx, debug):
     default=False,
     show_default=True,
 )
-def init(ctx, roles_path, force):
-    """Initialise new docs/ paths."""
-    ansible_readme = AnsibleReadme(roles_path, should_force=force, context=ctx)
-    ansible_readme.init_docs()
+@shard_option
+def init(ctx, roles_paths, force, shard):
+    """Initialise new docs/ paths (ROLES_PATHS defaults to .)."""
+    ansible_readmes = load_roots(
+        roles_paths or [str(pathlib.Path('.'))],
+        should_force=force,
+        limits=ctx.obj['limits'],
+        shard=shard,
+        context=ctx,
+    )
+
+    for ansible_readme in ansible_readmes:
+        ansible_readme.init_docs()
+
+    report_errors(ansible_readmes)
 
 
 @__main__.command(context_settings=CONTEXT_SETTINGS)
-@click.argument(
-    'roles-path', type=click.Path(exists=True), default=str(pathlib.Path('.'))
-)
+@click.argument('roles-paths', type=click.Path(exists=True), nargs=-1)
 @click.option(
     '--force/--no-force',
     help='Overwrite existing README files',
@@ -76,9 +170,7 @@ def init(ctx, roles_path, force):
     '-t',
     '--template',
     help='Jinja2 template for the README file.',
-    default=(
-        str(pathlib.Path(__file__).parent.absolute() / 'data' / 'readme.md.j2')
-    ),
+    default=str(DEFAULT_TEMPLATE),
     type=click.Path(exists=True),
     show_default=True,
 )
@@ -89,16 +181,142 @@ def init(ctx, roles_path, force):
     default='README.md',
     show_default=True,
 )
+@click.option(
+    '-o',
+    '--output',
+    help=(
+        'Write README files into an archive (.tar, .tar.gz, .tgz, .tar.bz2, '
+        '.tar.xz, .zip) instead of role paths (use - for a tar on stdout)'
+    ),
+    default=None,
+)
+@click.option(
+    '--cache-dir',
+    help='Directory (possibly shared) to cache rendered README files in',
+    default=None,
+    envvar='ANSIBLE_README_CACHE_DIR',
+    type=click.Path(file_okay=False),
+)
+@click.option(
+    '--value-max-items',
+    help='Most items rendered for each list or dictionary in defaults',
+    default=DEFAULT_VALUE_LIMITS.max_items,
+    type=click.IntRange(min=0),
+    show_default=True,
+)
+@click.option(
+    '--value-max-depth',
+    help='Deepest nesting rendered for default values',
+    default=DEFAULT_VALUE_LIMITS.max_depth,
+    type=click.IntRange(min=1),
+    show_default=True,
+)
+@click.option(
+    '--value-max-chars',
+    help='Most characters rendered for a single default value',
+    default=DEFAULT_VALUE_LIMITS.max_chars,
+    type=click.IntRange(min=0),
+    show_default=True,
+)
+@click.option(
+    '--lint/--no-lint',
+    help='Also lint the gathered docs and print a JSON report',
+    default=False,
+    show_default=True,
+)
+@jobs_option
+@shard_option
 @click.pass_context
-def generate(ctx, roles_path, force, template, name):
-    """Generate new README files."""
-    ansible_readme = AnsibleReadme(
-        roles_path,
-        should_force=force,
-        template=template,
-        readme_name=name,
-        debug=ctx.obj['debug'],
-        context=ctx,
-    )
+def generate(
+    ctx,
+    roles_paths,
+    force,
+    template,
+    name,
+    output,
+    cache_dir,
+    value_max_items,
+    value_max_depth,
+    value_max_chars,
+    lint,
+    jobs,
+    shard,
+):
+    """Generate new README files (ROLES_PATHS defaults to .)."""
+    if lint and output == '-':
+        raise click.UsageError('--lint cannot write to stdout with --output -')
+
+    # Keep stdout clean for the archive stream or lint report
+    with errors_only(output == '-' or lint):
+        ansible_readmes = load_roots(
+            roles_paths or [str(pathlib.Path('.'))],
+            should_force=force,
+            template=template,
+            readme_name=name,
+            output=output,
+            cache_dir=cache_dir,
+            value_limits=ValueLimits(
+                max_items=value_max_items,
+                max_depth=value_max_depth,
+                max_chars=value_max_chars,
+            ),
+            limits=ctx.obj['limits'],
+            shard=shard,
+            debug=ctx.obj['debug'],
+            context=ctx,
+        )
+        report = generate_roots(ansible_readmes, lint=lint, jobs=jobs)
+
+    if report is not None:
+        _echo_lint_report(ctx, report)
+
+
+def _echo_lint_report(ctx, report):
+    """Print a lint report as JSON, failing if it has any problems."""
+    click.echo(json.dumps(report, indent=2))
+
+    if report['problem_count']:
+        ctx.exit(1)
+
+
+@__main__.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('roles-paths', type=click.Path(exists=True), nargs=-1)
+@jobs_option
+@shard_option
+@click.pass_context
+def lint(ctx, roles_paths, jobs, shard):
+    """Lint role docs and print a JSON report (ROLES_PATHS defaults to .)."""
+    # Keep stdout clean for the lint report
+    with errors_only():
+        ansible_readmes = load_roots(
+            roles_paths or [str(pathlib.Path('.'))],
+            limits=ctx.obj['limits'],
+            shard=shard,
+            debug=ctx.obj['debug'],
+            context=ctx,
+        )
+        report = lint_roots(ansible_readmes, jobs)
+
+    _echo_lint_report(ctx, report)
 
-    ansible_readme.generate_readmes()
+
+@__main__.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('cache-dir', type=click.Path(file_okay=False, exists=True))
+@click.option(
+    '--max-age',
+    help='Remove entries not used for this many days',
+    default=None,
+    type=click.FloatRange(min=0),
+)
+@click.option(
+    '--max-size',
+    help='Remove least recently used entries until under this many bytes',
+    default=None,
+    type=click.IntRange(min=0),
+)
+def gc(cache_dir, max_age, max_size):
+    """Trim the rendered README cache."""
+    cache = ReadmeCache(cache_dir)
+    max_age_seconds = max_age * 24 * 60 * 60 if max_age is not None else None
+    removed, freed = cache.gc(max_age=max_age_seconds, max_size=max_size)
+    click.echo(f'Removed {removed} cache entries ({freed} bytes)')
@@ -5,20 +5,82 @@ any file system locations, configurations and other information relevant to
 aiding in documenting roles.
 """
 
+import concurrent.futures
+import contextlib
+import functools
+import gzip
+import hashlib
+import io
 import os
 import pathlib
+import sys
+import tarfile
+import time
 import typing
+import zipfile
 
 import attr
 import click
 import yaml
-from jinja2 import Environment, FileSystemLoader
-
-from ansible_readme.filters import listify, quicklistify
+from jinja2 import Environment, FileSystemLoader, Template, TemplateError
+
+from ansible_readme.cache import ReadmeCache
+from ansible_readme.filters import (
+    ValueLimits,
+    listify,
+    quicklistify,
+    yamlify,
+)
+from ansible_readme.lint import PLACEHOLDER_HELP, Problem, lint_role
+from ansible_readme.loader import LoadLimits, load_yaml
 from ansible_readme.logger import get_logger, red_text
 
 log = get_logger(__name__)
 
+if typing.TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    # Modes handed to tarfile.open (or 'zip' for zipfile) by write_archive
+    ArchiveMode = Literal['w|', 'w|gz', 'w|bz2', 'w|xz', 'zip']
+
+
+DEFAULT_TEMPLATE = (
+    pathlib.Path(__file__).parent.absolute() / 'data' / 'readme.md.j2'
+)
+
+
+class AnsibleReadmeError(click.ClickException):
+    """Ansible-Readme failed to document roles."""
+
+    def format_message(self) -> str:
+        return red_text(self.message)
+
+
+def build_environment(
+    template: pathlib.Path,
+    value_limits: typing.Optional[ValueLimits] = None,
+) -> Environment:
+    """Prepare a Jinja2 environment able to load 'template'.
+
+    Default values rendered with the yamlify filter stay within
+    'value_limits'.
+    """
+    template_path = str(pathlib.Path(template).parent.absolute())
+
+    jinja_env = Environment(
+        loader=FileSystemLoader(template_path),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+    jinja_env.filters['listify'] = listify
+    jinja_env.filters['quicklistify'] = quicklistify
+    jinja_env.filters['yamlify'] = functools.partial(
+        yamlify, limits=value_limits or ValueLimits()
+    )
+
+    return jinja_env
+
 
 @attr.s(auto_attribs=True)
 class AnsibleReadme:
@@ -44,6 +106,9 @@ class AnsibleReadme:
     # Rendered readme files generated and populated with self.role_docs
     role_readmes: typing.Dict[str, str] = attr.ib(default=attr.Factory(dict))
 
+    # Errors encountered per role, those roles are skipped after failing
+    role_errors: typing.Dict[str, str] = attr.ib(default=attr.Factory(dict))
+
     # Conventional Ansible role paths to help identify roles programmatically
     STANDARD_ROLE_PATHS: typing.List[str] = [
         'defaults',
@@ -59,25 +124,67 @@ class AnsibleReadme:
     should_force: bool = attr.ib(default=False)
 
     # Jinaj2 template to use for README generation
-    template: pathlib.Path = attr.ib(
-        default=pathlib.Path(__file__).parent.absolute()
-        / 'data'
-        / 'readme.md.j2'
-    )
+    template: pathlib.Path = attr.ib(default=DEFAULT_TEMPLATE)
+
+    # Jinja2 environment for loading the template, may be shared between
+    # several AnsibleReadme objects rendering with the same template
+    environment: typing.Optional[Environment] = attr.ib(default=None)
 
     # Default generated README file name
     readme_name: str = attr.ib(default='README.md')
 
+    # Archive (.tar, .tar.gz, .tgz, .tar.bz2, .tar.xz, .zip) or '-' (tar
+    # stream on stdout) to write README files into instead of role paths
+    output: typing.Optional[str] = attr.ib(default=None)
+
+    # Archive file name suffixes and their tarfile stream modes
+    ARCHIVE_MODES: typing.Dict[str, 'ArchiveMode'] = {
+        '.tar': 'w|',
+        '.tar.gz': 'w|gz',
+        '.tgz': 'w|gz',
+        '.tar.bz2': 'w|bz2',
+        '.tar.xz': 'w|xz',
+        '.zip': 'zip',
+    }
+
+    # Resource limits applied when loading role YAML files
+    limits: LoadLimits = attr.ib(default=attr.Factory(LoadLimits))
+
+    # Limits applied when rendering default values into README files
+    value_limits: ValueLimits = attr.ib(default=attr.Factory(ValueLimits))
+
+    # Shared directory of rendered README files keyed by their inputs
+    cache_dir: typing.Optional[pathlib.Path] = attr.ib(default=None)
+
+    # Only handle roles in shard INDEX of COUNT (1-based), see shard_of
+    shard: typing.Optional[typing.Tuple[int, int]] = attr.ib(default=None)
+
     # Whether or not to output debugging information
     debug: bool = attr.ib(default=False)
 
     # Click based command line context
     context: typing.Any = attr.ib(default=None)
 
+    # Command being run (defaults to the name of the command in self.context)
+    command: typing.Optional[str] = attr.ib(default=None)
+
+    # Template contents, read once when first needed for cache keys
+    _template_bytes: typing.Optional[bytes] = attr.ib(default=None, init=False)
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        """Drop state which worker processes neither need nor can unpickle."""
+        state = self.__dict__.copy()
+        state.update(environment=None, context=None)
+        return state
+
     def __attrs_post_init__(self):
         """Initalise state after validation has run through."""
         self.path = pathlib.Path(self.path).absolute()
-        self.role_paths = self.gather_role_paths()
+
+        if self.command is None and self.context is not None:
+            self.command = self.context.command.name
+
+        self.role_paths = self.shard_role_paths(self.gather_role_paths())
 
         if self.debug:
             paths = ', '.join(map(str, self.role_paths))
@@ -98,10 +205,41 @@ class AnsibleReadme:
                 log.info(f'{path} contains {msg}')
             return None
 
-        raise click.ClickException(
-            red_text(f'{path} does not contain any Ansible roles?')
+        raise AnsibleReadmeError(f'{path} does not contain any Ansible roles?')
+
+    @shard.validator
+    def __check_shard(
+        self,
+        attribute: attr.Attribute,
+        value: typing.Optional[typing.Tuple[int, int]],
+    ) -> typing.Optional[Exception]:
+        """Ensure 'value' is a valid shard INDEX of COUNT."""
+        return check_shard(value)
+
+    @output.validator
+    def __check_output(
+        self, attribute: attr.Attribute, value: typing.Optional[str]
+    ) -> typing.Optional[Exception]:
+        """Ensure 'value' names an archive format we know how to write."""
+        if value is None or value == '-' or self.archive_mode(value):
+            return None
+
+        formats = ', '.join(self.ARCHIVE_MODES)
+        raise AnsibleReadmeError(
+            f'{value} is not a supported archive ({formats})'
         )
 
+    def archive_mode(self, output: str) -> typing.Optional['ArchiveMode']:
+        """Which archive mode should be used to write 'output'?"""
+        if output == '-':
+            return 'w|'
+
+        for suffix, mode in self.ARCHIVE_MODES.items():
+            if output.endswith(suffix):
+                return mode
+
+        return None
+
     def has_standard_role_paths(self, path: pathlib.Path) -> bool:
         """Does 'path' contain standard role paths?"""
         _dirs = [
@@ -150,12 +288,28 @@ class AnsibleReadme:
     def gather_role_paths(self) -> typing.List[pathlib.Path]:
         """Retrieve a list of valid role paths after validation."""
         if self.is_single_role:
-            return [self.path]
+            role_paths = [self.path]
+        else:
+            role_paths = [
+                pathlib.Path(self.path / role_path)
+                for role_path in os.listdir(self.path)
+                if os.path.isdir(self.path / role_path)
+            ]
+
+        return role_paths
+
+    def shard_role_paths(
+        self, role_paths: typing.List[pathlib.Path]
+    ) -> typing.List[pathlib.Path]:
+        """Keep only the role paths which belong to self.shard."""
+        if self.shard is None:
+            return role_paths
 
         return [
-            pathlib.Path(self.path / role_path)
-            for role_path in os.listdir(self.path)
-            if os.path.isdir(self.path / role_path)
+            role_path
+            for role_path in role_paths
+            if shard_of(role_path, self.archive_root, self.shard[1])
+            == self.shard[0]
         ]
 
     def do_gathering(self, path: pathlib.Path) -> typing.Dict[str, typing.Any]:
@@ -163,9 +317,8 @@ class AnsibleReadme:
         contents: typing.Dict[str, typing.Any] = {}
 
         if os.path.exists(path):
-            with open(path) as file:
-                loaded = yaml.load(file.read(), Loader=yaml.SafeLoader)
-                contents = loaded if loaded else {}
+            loaded = load_yaml(path, self.limits)
+            contents = loaded if loaded else {}
 
         return contents
 
@@ -173,15 +326,28 @@ class AnsibleReadme:
         """Gather all meta for a role."""
         contents = self.do_gathering(path / 'meta' / 'main.yml')
 
-        if 'galaxy_info' not in contents:
+        if isinstance(contents, dict) and 'galaxy_info' not in contents:
             contents['galaxy_info'] = {}
 
         return contents
 
     def gather_docs(self, path: pathlib.Path) -> typing.Dict[str, typing.Any]:
         """Gather docs/ path documentation for a role."""
+        if self.output is not None and not os.path.exists(path / 'docs'):
+            # Archives are written without creating docs/ in the checkout
+            return self.default_docs(path)
+
         return self.do_gathering(path / 'docs' / 'main.yml')
 
+    def default_docs(self, path: pathlib.Path) -> typing.Dict[str, typing.Any]:
+        """Placeholder documentation for the defaults of the role at 'path'."""
+        return {
+            'defaults': {
+                default: {'help': PLACEHOLDER_HELP}
+                for default in self.gather_defaults(path)
+            }
+        }
+
     def gather_defaults(
         self, path: pathlib.Path
     ) -> typing.Dict[str, typing.Any]:
@@ -194,111 +360,554 @@ class AnsibleReadme:
         contents['role_name'] = os.path.basename(path)
         return contents
 
-    def gather_all(self) -> typing.Dict[str, typing.Any]:
-        """Gather all documentation for roles."""
+    def gather_role(self, path: pathlib.Path) -> typing.Dict[str, typing.Any]:
+        """Gather all documentation for the role at 'path'."""
+        role_name = os.path.basename(path)
+
+        self.role_docs[role_name] = {
+            'meta': self.gather_meta(path),
+            'defaults': self.gather_defaults(path),
+            'extras': self.gather_extras(path),
+            'docs': self.gather_docs(path),
+        }
+
+        return self.role_docs[role_name]
+
+    def gather_all(
+        self, skip_cached: bool = False
+    ) -> typing.Dict[str, typing.Any]:
+        """Gather all documentation for roles.
+
+        With 'skip_cached', roles with a cached README are not gathered at
+        all, see load_cached_readme.
+        """
         for path in self.role_paths:
             role_name = os.path.basename(path)
-            self.role_docs[role_name] = {
-                'meta': self.gather_meta(path),
-                'defaults': self.gather_defaults(path),
-                'extras': self.gather_extras(path),
-                'docs': self.gather_docs(path),
-            }
+            if role_name in self.role_errors:
+                continue
+
+            if skip_cached and self.load_cached_readme(path):
+                continue
+
+            try:
+                self.gather_role(path)
+            except yaml.YAMLError as exception:
+                self.fail_role(role_name, exception)
 
         if self.debug:
             log.info(f'Gathered role documentation: {self.role_docs}')
 
         return self.role_docs
 
-    def render_readmes(self) -> typing.Dict[str, str]:
-        """Render README file templates using Jinja2 with gathered docs."""
-        template_path = str(pathlib.Path(self.template).parent.absolute())
+    def fail_role(self, role_name: str, exception: Exception) -> None:
+        """Record that 'role_name' failed and carry on with other roles."""
+        self.role_errors[role_name] = str(exception)
+        log.error(f'Skipping {role_name}: {exception}')
+
+    def report_errors(self) -> None:
+        """Fail when any roles were skipped due to errors."""
+        report_errors([self])
+
+    def lint_role_path(self, path: pathlib.Path) -> typing.List[Problem]:
+        """Lint the role at 'path', gathering it first if needed."""
+        role_name = os.path.basename(path)
+
+        is_gathered = role_name in self.role_docs
+        if not is_gathered and role_name not in self.role_errors:
+            try:
+                self.gather_role(path)
+            except yaml.YAMLError as exception:
+                self.fail_role(role_name, exception)
+
+        if role_name not in self.role_docs:
+            error = self.role_errors[role_name]
+            return [Problem(rule='load-error', message=error)]
+
+        problems = lint_role(self.role_docs[role_name])
+        if role_name in self.role_errors:
+            # Gathered fine but failed to render
+            error = self.role_errors[role_name]
+            problems.append(Problem(rule='render-error', message=error))
+
+        return problems
+
+    def lint_roles(
+        self, jobs: typing.Optional[int] = None
+    ) -> typing.Dict[pathlib.Path, typing.List[Problem]]:
+        """Lint all roles, gathering them in parallel (see gather_roots)."""
+        gather_roots([self], jobs)
+        return {path: self.lint_role_path(path) for path in self.role_paths}
+
+    def get_template(self) -> Template:
+        """Load the README template from the (possibly shared) environment."""
+        if self.environment is None:
+            self.environment = build_environment(
+                self.template, self.value_limits
+            )
 
-        jinja_env = Environment(
-            loader=FileSystemLoader(template_path),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        return self.environment.get_template(os.path.basename(self.template))
+
+    def cache_key(self, cache: ReadmeCache, path: pathlib.Path) -> str:
+        """Key of the cached README for the role at 'path'."""
+        if self._template_bytes is None:
+            with open(self.template, 'rb') as handle:
+                self._template_bytes = handle.read()
 
-        jinja_env.filters['listify'] = listify
-        jinja_env.filters['quicklistify'] = quicklistify
+        return cache.key(path, self._template_bytes, [repr(self.value_limits)])
 
-        template = jinja_env.get_template(os.path.basename(self.template))
+    def load_cached_readme(self, path: pathlib.Path) -> bool:
+        """Use the cached README of the role at 'path' if there is one.
+
+        Cache keys only hash raw role files, so a hit skips parsing them as
+        well as rendering.
+        """
+        if self.cache_dir is None:
+            return False
+
+        role_name = os.path.basename(path)
+        cache = ReadmeCache(self.cache_dir)
+        key = self.cache_key(cache, path)
+        readme = cache.get(key)
+
+        if readme is None:
+            return False
 
-        for role_doc in self.role_docs:
-            self.role_readmes[role_doc] = template.render(
-                **self.role_docs[role_doc]
+        if self.debug:
+            log.info(f'Using cached README for {role_name} ({key})')
+
+        self.role_readmes[role_name] = readme
+        return True
+
+    def render_role(self, path: pathlib.Path) -> str:
+        """Render the README for the gathered role at 'path'."""
+        role_name = os.path.basename(path)
+        template = self.get_template()
+
+        if self.cache_dir is None:
+            self.role_readmes[role_name] = template.render(
+                **self.role_docs[role_name]
             )
+            return self.role_readmes[role_name]
 
-        return self.role_readmes
+        cache = ReadmeCache(self.cache_dir)
+        key = self.cache_key(cache, path)
+        readme = cache.get(key)
 
-    def write_readmes(self) -> None:
-        """Write README files from rendered templates."""
+        if readme is None:
+            readme = template.render(**self.role_docs[role_name])
+            cache.put(key, readme)
+        elif self.debug:
+            log.info(f'Using cached README for {role_name} ({key})')
+
+        self.role_readmes[role_name] = readme
+        return readme
+
+    def render_readmes(self) -> typing.Dict[str, str]:
+        """Render README file templates using Jinja2 with gathered docs."""
         for path in self.role_paths:
             role_name = os.path.basename(path)
-            readme_path = path / self.readme_name
+            if role_name not in self.role_docs:
+                continue
 
-            if self.debug:
-                log.info(
-                    'README will look like:\n\n{}'.format(
-                        self.role_readmes[role_name]
-                    )
-                )
+            try:
+                self.render_role(path)
+            except TemplateError as exception:
+                self.fail_role(role_name, exception)
+
+        return self.role_readmes
+
+    def write_role(self, path: pathlib.Path) -> bool:
+        """Write the rendered README for the role at 'path'.
+
+        Returns False when the README on disk is already up to date.
+        """
+        role_name = os.path.basename(path)
+        readme_path = path / self.readme_name
+        readme = self.role_readmes[role_name]
+
+        if self.debug:
+            log.info('README will look like:\n\n{}'.format(readme))
 
-            if os.path.exists(readme_path) and not self.should_force:
+        if os.path.exists(readme_path):
+            with open(readme_path) as readme_handle:
+                if readme_handle.read() == readme:
+                    return False
+
+            if not self.should_force:
                 msg = (
                     'Discovered {} which already exists, refusing '
                     'to overwrite (pass --force to override this)'
                 ).format(readme_path)
-                raise click.ClickException(red_text(msg))
+                raise AnsibleReadmeError(msg)
+
+        with open(readme_path, 'w') as readme_handle:
+            readme_handle.write(readme)
+
+        return True
+
+    def write_readmes(self) -> None:
+        """Write README files from rendered templates."""
+        for path in self.role_paths:
+            if os.path.basename(path) in self.role_readmes:
+                self.write_role(path)
+
+    @property
+    def archive_root(self) -> pathlib.Path:
+        """Path which role paths are archived and sharded relative to."""
+        return self.path.parent if self.is_single_role else self.path
+
+    def archive_members(
+        self, root: typing.Optional[pathlib.Path] = None
+    ) -> typing.Iterator[typing.Tuple[str, bytes]]:
+        """Role relative README paths and contents for archiving."""
+        root = root or self.archive_root
+
+        for path in self.role_paths:
+            role_name = os.path.basename(path)
+            if role_name not in self.role_readmes:
+                continue
 
-            with open(readme_path, 'w') as readme_handle:
-                readme_handle.write(self.role_readmes[role_name])
+            member = path.relative_to(root) / self.readme_name
+            yield member.as_posix(), self.role_readmes[role_name].encode()
+
+    def write_archive(self) -> None:
+        """Write README files from rendered templates into one archive."""
+        assert self.output is not None
+        write_readme_archive(self.output, [self])
 
     def generate_readmes(self) -> None:
         """Generate READMEs for discovered roles."""
-        self.init_docs()
-        self.gather_all()
-        self.render_readmes()
-        self.write_readmes()
+        generate_roots([self])
+
+    def init_role_docs(self, role_path: pathlib.Path) -> bool:
+        """Generate the docs/ folder with defaults for the role at 'path'.
+
+        Returns False when an existing docs/ folder was left alone.
+        """
+        docs_path = role_path / 'docs'
+
+        is_init_without_force = (
+            self.command == 'init'
+            and os.path.exists(docs_path)
+            and not self.should_force
+        )
+
+        another_cmd = self.command != 'init' and os.path.exists(docs_path)
+
+        if is_init_without_force or another_cmd:
+            log.info(
+                f'{docs_path} already exists, skipping '
+                '(use init command with --force to override)'
+            )
+            return False
+
+        docs = self.default_docs(role_path)
+
+        if not os.path.exists(docs_path):
+            os.mkdir(docs_path)
+
+        with open(docs_path / 'main.yml', 'w') as docs_file:
+            yaml.dump(
+                docs, docs_file, explicit_start=True, default_flow_style=False
+            )
+
+        return True
 
     def init_docs(self) -> None:
         """Generate docs/ folders with defaults."""
         for role_path in self.role_paths:
-            docs: typing.Dict[str, typing.Any] = {'defaults': {}}
-            docs_path = role_path / 'docs'
+            try:
+                self.init_role_docs(role_path)
+            except yaml.YAMLError as exception:
+                self.fail_role(os.path.basename(role_path), exception)
 
-            is_init_without_force = (
-                self.context.command.name == 'init'
-                and os.path.exists(docs_path)
-                and not self.should_force
-            )
+        return None
 
-            another_cmd = (
-                self.context.command.name != 'init'
-                and os.path.exists(docs_path)
-            )
 
-            if is_init_without_force or another_cmd:
-                log.info(
-                    f'{docs_path} already exists, skipping '
-                    '(use init command with --force to override)'
-                )
+def check_shard(
+    shard: typing.Optional[typing.Tuple[int, int]]
+) -> typing.Optional[Exception]:
+    """Ensure 'shard' is a valid shard INDEX of COUNT."""
+    if shard is None or 1 <= shard[0] <= shard[1]:
+        return None
+
+    raise AnsibleReadmeError(
+        f'Shard {shard[0]}/{shard[1]} must be between 1/N and N/N'
+    )
+
+
+def shard_of(path: pathlib.Path, root: pathlib.Path, count: int) -> int:
+    """Which of 'count' shards (1-based) the role at 'path' belongs to.
+
+    Roles are assigned by a hash of their path relative to the 'root' they
+    were found in, so assignments do not depend on the working directory or
+    on where symlinked roles point, and do not move when unrelated roles are
+    added or removed.
+    """
+    role_path = pathlib.PurePath(os.path.relpath(path, root))
+    digest = hashlib.sha256(role_path.as_posix().encode())
+    return int(digest.hexdigest(), 16) % count + 1
+
+
+def role_identity(path: pathlib.Path) -> typing.Tuple[int, int]:
+    """Identify the role at 'path' regardless of how it was reached."""
+    stat = os.stat(path.resolve())
+    return stat.st_dev, stat.st_ino
+
+
+def dedupe_role_paths(
+    ansible_readmes: typing.Iterable[AnsibleReadme],
+) -> None:
+    """Drop roles already reached through another root, path or symlink."""
+    seen: typing.Set[typing.Tuple[int, int]] = set()
+
+    for ansible_readme in ansible_readmes:
+        role_paths = []
+        for role_path in ansible_readme.role_paths:
+            identity = role_identity(role_path)
+            if identity in seen:
+                if ansible_readme.debug:
+                    log.info(f'Skipping {role_path}, already discovered')
                 continue
+            seen.add(identity)
+            role_paths.append(role_path)
+        ansible_readme.role_paths = role_paths
+
+
+def load_roots(
+    paths: typing.Iterable[typing.Union[str, os.PathLike]],
+    template: typing.Union[str, os.PathLike] = DEFAULT_TEMPLATE,
+    **kwargs: typing.Any,
+) -> typing.List[AnsibleReadme]:
+    """Prepare one AnsibleReadme per root sharing a template environment.
+
+    Roles reachable from several roots are only kept for the first root. Any
+    'shard' is applied afterwards to the kept paths, so a role reached
+    through several roots still lands in a single shard.
+    """
+    shard = kwargs.pop('shard', None)
+    check_shard(shard)
+
+    environment = build_environment(
+        pathlib.Path(template), kwargs.get('value_limits')
+    )
+
+    ansible_readmes = [
+        AnsibleReadme(
+            pathlib.Path(path),
+            template=pathlib.Path(template),
+            environment=environment,
+            **kwargs,
+        )
+        for path in paths
+    ]
+    dedupe_role_paths(ansible_readmes)
+
+    for ansible_readme in ansible_readmes:
+        ansible_readme.shard = shard
+        ansible_readme.role_paths = ansible_readme.shard_role_paths(
+            ansible_readme.role_paths
+        )
+
+    return ansible_readmes
+
+
+def report_errors(ansible_readmes: typing.Iterable[AnsibleReadme]) -> None:
+    """Fail when any roles were skipped due to errors."""
+    role_errors = [
+        role_name
+        for ansible_readme in ansible_readmes
+        for role_name in ansible_readme.role_errors
+    ]
 
-            if not os.path.exists(docs_path):
-                os.mkdir(docs_path)
+    if not role_errors:
+        return None
+
+    msg = 'Failed to process {} role(s): {}'.format(
+        len(role_errors), ', '.join(sorted(role_errors))
+    )
+    raise AnsibleReadmeError(msg)
+
+
+def archive_mtime() -> int:
+    """Modification time stamped on archive members.
+
+    Fixed (at SOURCE_DATE_EPOCH when set) so that the same README files always
+    produce the same archive.
+    """
+    return int(os.environ.get('SOURCE_DATE_EPOCH', 0))
 
-            defaults = self.gather_defaults(role_path)
-            for default in defaults:
-                docs['defaults'].update({default: {'help': 'TODO.'}})
 
-            with open(docs_path / 'main.yml', 'w') as docs_file:
-                yaml.dump(
-                    docs,
-                    docs_file,
-                    explicit_start=True,
-                    default_flow_style=False,
+def write_readme_archive(
+    output: str, ansible_readmes: typing.Sequence[AnsibleReadme]
+) -> None:
+    """Write rendered README files of all roots into one archive.
+
+    Members are stored relative to the common parent of the roots.
+    """
+    mode = ansible_readmes[0].archive_mode(output)
+    assert mode is not None
+    root = pathlib.Path(
+        os.path.commonpath(
+            [ansible_readme.archive_root for ansible_readme in ansible_readmes]
+        )
+    )
+    members = (
+        member
+        for ansible_readme in ansible_readmes
+        for member in ansible_readme.archive_members(root)
+    )
+
+    mtime = archive_mtime()
+
+    if mode == 'zip':
+        # Zip timestamps cannot go back further than 1980
+        date_time = time.gmtime(max(mtime, 315532800))[:6]
+        with zipfile.ZipFile(output, 'w') as zip_archive:
+            for member, contents in members:
+                zip_info = zipfile.ZipInfo(member, date_time=date_time)
+                zip_info.compress_type = zipfile.ZIP_DEFLATED
+                zip_info.external_attr = 0o644 << 16
+                zip_archive.writestr(zip_info, contents)
+        return None
+
+    with contextlib.ExitStack() as stack:
+        fileobj: typing.Union[typing.IO[bytes], gzip.GzipFile]
+        if output == '-':
+            fileobj = sys.stdout.buffer
+        else:
+            fileobj = stack.enter_context(open(output, 'wb'))
+
+        if mode == 'w|gz':
+            # The gzip header would otherwise carry the current time
+            fileobj = stack.enter_context(
+                gzip.GzipFile(
+                    filename='', mode='wb', fileobj=fileobj, mtime=mtime
                 )
+            )
+            mode = 'w|'
+
+        archive = stack.enter_context(tarfile.open(fileobj=fileobj, mode=mode))
+        for member, contents in members:
+            info = tarfile.TarInfo(member)
+            info.size = len(contents)
+            info.mtime = mtime
+            archive.addfile(info, io.BytesIO(contents))
+
+    return None
+
+
+# Roots whose roles are gathered in a worker process, see gather_roots
+_worker_readmes: typing.List[AnsibleReadme] = []
+
+
+def _init_gather_worker(ansible_readmes: typing.List[AnsibleReadme]) -> None:
+    _worker_readmes[:] = ansible_readmes
 
+
+def _gather_in_worker(
+    index: int, path: pathlib.Path
+) -> typing.Dict[str, typing.Any]:
+    return _worker_readmes[index].gather_role(path)
+
+
+def gather_roots(
+    ansible_readmes: typing.Sequence[AnsibleReadme],
+    jobs: typing.Optional[int] = None,
+) -> None:
+    """Gather all roles of all roots which are not gathered yet.
+
+    Loading YAML is pure Python and holds the GIL, so roles are gathered by
+    one pool of 'jobs' processes (defaulting to the CPU count) shared by all
+    roots rather than by threads.
+    """
+    pending = [
+        (index, path)
+        for index, ansible_readme in enumerate(ansible_readmes)
+        for path in ansible_readme.role_paths
+        if os.path.basename(path) not in ansible_readme.role_docs
+        and os.path.basename(path) not in ansible_readme.role_errors
+    ]
+    if not pending:
         return None
+
+    workers = min(jobs or os.cpu_count() or 1, len(pending))
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_gather_worker,
+        initargs=(list(ansible_readmes),),
+    ) as pool:
+        futures = [
+            pool.submit(_gather_in_worker, index, path)
+            for index, path in pending
+        ]
+
+        for (index, path), future in zip(pending, futures):
+            ansible_readme = ansible_readmes[index]
+            role_name = os.path.basename(path)
+            try:
+                ansible_readme.role_docs[role_name] = future.result()
+            except yaml.YAMLError as exception:
+                ansible_readme.fail_role(role_name, exception)
+
+    return None
+
+
+def lint_roots(
+    ansible_readmes: typing.Sequence[AnsibleReadme],
+    jobs: typing.Optional[int] = None,
+) -> typing.Dict[str, typing.Any]:
+    """Lint the discovered roles of all roots into a JSON friendly report."""
+    gather_roots(ansible_readmes, jobs)
+
+    roles: typing.List[typing.Dict[str, typing.Any]] = [
+        {
+            'role': os.path.basename(path),
+            'path': str(path),
+            'problems': [
+                attr.asdict(problem)
+                for problem in ansible_readme.lint_role_path(path)
+            ],
+        }
+        for ansible_readme in ansible_readmes
+        for path in ansible_readme.role_paths
+    ]
+    roles.sort(key=lambda role: role['path'])
+
+    return {
+        'roles': roles,
+        'problem_count': sum(len(role['problems']) for role in roles),
+    }
+
+
+def generate_roots(
+    ansible_readmes: typing.Sequence[AnsibleReadme],
+    lint: bool = False,
+    jobs: typing.Optional[int] = None,
+) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Generate READMEs for the discovered roles of all roots.
+
+    Roles with a cached README are neither gathered nor rendered, unless
+    'lint' is set. With 'lint', the gathered docs are also linted and the
+    lint report is returned. Roles which failed to load are then reported in
+    it instead of raising.
+    """
+    for ansible_readme in ansible_readmes:
+        if ansible_readme.output is None:
+            # Archived READMEs use placeholder docs, see gather_docs
+            ansible_readme.init_docs()
+        ansible_readme.gather_all(skip_cached=not lint)
+        ansible_readme.render_readmes()
+
+    output = ansible_readmes[0].output if ansible_readmes else None
+    if output:
+        write_readme_archive(output, ansible_readmes)
+    else:
+        for ansible_readme in ansible_readmes:
+            ansible_readme.write_readmes()
+
+    if lint:
+        return lint_roots(ansible_readmes, jobs)
+
+    report_errors(ansible_readmes)
+    return None
@@ -0,0 +1,149 @@
+"""Programmatic API module.
+
+Drive README generation from Python without a Click context. Many roots can
+be handled in one call, sharing a single template environment and worker pool
+between them, and structured results are returned for each role.
+"""
+
+import concurrent.futures
+import os
+import pathlib
+import time
+import typing
+
+import attr
+import jinja2
+import yaml
+
+from ansible_readme.ansible_readme import (
+    DEFAULT_TEMPLATE,
+    AnsibleReadme,
+    AnsibleReadmeError,
+    build_environment,
+    dedupe_role_paths,
+)
+from ansible_readme.filters import ValueLimits
+from ansible_readme.loader import LoadLimits
+
+WRITTEN = 'written'
+UNCHANGED = 'unchanged'
+ERROR = 'error'
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class RoleResult:
+    """Outcome of generating the README for a single role."""
+
+    # Path of the role (or of the root, when the root could not be used)
+    path: pathlib.Path
+
+    # One of WRITTEN, UNCHANGED or ERROR
+    status: str
+
+    # Path of the README file, unset when generation failed
+    readme_path: typing.Optional[pathlib.Path] = None
+
+    # Reason generation failed
+    error: typing.Optional[str] = None
+
+    # Time taken to generate the README (seconds)
+    duration: float = 0.0
+
+
+def _generate_role(
+    ansible_readme: AnsibleReadme, role_path: pathlib.Path
+) -> RoleResult:
+    """Generate the README for one role, capturing any failure."""
+    start = time.perf_counter()
+
+    try:
+        ansible_readme.init_role_docs(role_path)
+        if not ansible_readme.load_cached_readme(role_path):
+            ansible_readme.gather_role(role_path)
+            ansible_readme.render_role(role_path)
+        written = ansible_readme.write_role(role_path)
+    except AnsibleReadmeError as exception:
+        error = exception.message
+    except (
+        yaml.YAMLError,
+        jinja2.TemplateError,
+        OSError,
+        UnicodeDecodeError,
+        ValueError,
+    ) as exception:
+        error = str(exception)
+    else:
+        return RoleResult(
+            path=role_path,
+            status=WRITTEN if written else UNCHANGED,
+            readme_path=role_path / ansible_readme.readme_name,
+            duration=time.perf_counter() - start,
+        )
+
+    return RoleResult(
+        path=role_path,
+        status=ERROR,
+        error=error,
+        duration=time.perf_counter() - start,
+    )
+
+
+def generate(
+    paths: typing.Iterable[typing.Union[str, os.PathLike]],
+    template: typing.Union[str, os.PathLike] = DEFAULT_TEMPLATE,
+    readme_name: str = 'README.md',
+    force: bool = False,
+    jobs: typing.Optional[int] = None,
+    cache_dir: typing.Optional[typing.Union[str, os.PathLike]] = None,
+    limits: typing.Optional[LoadLimits] = None,
+    value_limits: typing.Optional[ValueLimits] = None,
+) -> typing.List[RoleResult]:
+    """Generate README files for all roles found under 'paths'.
+
+    Roles reachable through several roots (overlapping paths or symlinks)
+    are only generated once. Roles are processed by a pool of 'jobs' threads
+    (defaulting to the concurrent.futures choice). Failures are reported in
+    the results rather than raised so that one broken role or root does not
+    stop the rest.
+    """
+    cache_path = pathlib.Path(cache_dir) if cache_dir is not None else None
+    value_limits = value_limits or ValueLimits()
+    environment = build_environment(pathlib.Path(template), value_limits)
+    results: typing.List[RoleResult] = []
+    ansible_readmes: typing.List[AnsibleReadme] = []
+
+    for path in paths:
+        try:
+            ansible_readmes.append(
+                AnsibleReadme(
+                    pathlib.Path(path),
+                    should_force=force,
+                    template=pathlib.Path(template),
+                    environment=environment,
+                    readme_name=readme_name,
+                    cache_dir=cache_path,
+                    limits=limits or LoadLimits(),
+                    value_limits=value_limits,
+                    command='generate',
+                )
+            )
+        except AnsibleReadmeError as exception:
+            results.append(
+                RoleResult(
+                    path=pathlib.Path(path).absolute(),
+                    status=ERROR,
+                    error=exception.message,
+                )
+            )
+
+    dedupe_role_paths(ansible_readmes)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(_generate_role, ansible_readme, role_path)
+            for ansible_readme in ansible_readmes
+            for role_path in ansible_readme.role_paths
+        ]
+        results.extend(future.result() for future in futures)
+
+    return results
@@ -0,0 +1,149 @@
+"""Content addressed README cache module.
+
+Rendered README files are stored under a hash of everything which went into
+rendering them: the role input files, the template and the Ansible-Readme
+version. The cache directory can be shared between CI runners (a mounted
+volume for example) since entries are immutable and written atomically.
+"""
+
+import hashlib
+import os
+import pathlib
+import tempfile
+import time
+import typing
+
+import attr
+
+from ansible_readme.__version__ import __version__
+
+
+@attr.s(auto_attribs=True)
+class ReadmeCache:
+    """Rendered README files keyed by a hash of their inputs."""
+
+    # Directory holding cache entries
+    path: pathlib.Path = attr.ib(converter=pathlib.Path)
+
+    # Role files which are read to render a README
+    ROLE_INPUTS: typing.List[str] = [
+        'defaults/main.yml',
+        'docs/main.yml',
+        'meta/main.yml',
+    ]
+
+    def key(
+        self,
+        role_path: pathlib.Path,
+        template: bytes,
+        extras: typing.Iterable[str] = (),
+    ) -> str:
+        """Hash the role inputs, template bytes and version into a key."""
+        digest = hashlib.sha256()
+
+        for part in (__version__.encode(), template):
+            digest.update(b'%d:' % len(part))
+            digest.update(part)
+
+        digest.update(os.path.basename(role_path).encode() + b'\0')
+        for extra in extras:
+            digest.update(extra.encode() + b'\0')
+
+        for role_input in self.ROLE_INPUTS:
+            digest.update(role_input.encode() + b'\0')
+            try:
+                with open(role_path / role_input, 'rb') as handle:
+                    contents = handle.read()
+            except FileNotFoundError:
+                digest.update(b'-')
+                continue
+            digest.update(b'%d:' % len(contents))
+            digest.update(contents)
+
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> pathlib.Path:
+        """Where the entry for 'key' lives on disk."""
+        return self.path / key[:2] / key
+
+    def get(self, key: str) -> typing.Optional[str]:
+        """Retrieve cached contents for 'key' if there are any."""
+        entry = self.entry_path(key)
+
+        try:
+            with open(entry, encoding='utf-8') as handle:
+                contents = handle.read()
+        except FileNotFoundError:
+            return None
+
+        # Mark the entry as recently used for garbage collection
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+        return contents
+
+    def put(self, key: str, contents: str) -> None:
+        """Store 'contents' under 'key' atomically."""
+        entry = self.entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=entry.parent, prefix='.tmp-')
+        try:
+            os.chmod(tmp_path, 0o644)
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                handle.write(contents)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def entries(self) -> typing.List[typing.Tuple[pathlib.Path, typing.Any]]:
+        """All cache entries along with their file stats."""
+        found: typing.List[typing.Tuple[pathlib.Path, typing.Any]] = []
+
+        if not os.path.isdir(self.path):
+            return found
+
+        for bucket in os.scandir(self.path):
+            if not bucket.is_dir() or len(bucket.name) != 2:
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.is_file() and not entry.name.startswith('.tmp-'):
+                    found.append((pathlib.Path(entry.path), entry.stat()))
+
+        return found
+
+    def gc(
+        self,
+        max_age: typing.Optional[float] = None,
+        max_size: typing.Optional[int] = None,
+    ) -> typing.Tuple[int, int]:
+        """Trim entries older than 'max_age' seconds and down to 'max_size'.
+
+        Least recently used entries are removed first. Returns the number of
+        removed entries and the number of bytes freed.
+        """
+        entries = sorted(self.entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        now = time.time()
+
+        removed, freed = 0, 0
+        for path, stat in entries:
+            too_old = max_age is not None and now - stat.st_mtime > max_age
+            too_big = max_size is not None and total > max_size
+            if not too_old and not too_big:
+                break
+
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                # Another runner collected it first
+                pass
+
+            total -= stat.st_size
+            removed += 1
+            freed += stat.st_size
+
+        return removed, freed
@@ -1,7 +1,35 @@
 """Jinja2 filters module."""
 
+import itertools
+import json
+import re
 import typing
 
+import attr
+
+# Strings which can be written as plain YAML scalars without changing meaning
+PLAIN_SCALAR = re.compile(r'[A-Za-z_][A-Za-z0-9_./-]*')
+
+# Plain strings which YAML would otherwise read as booleans or null
+RESERVED_SCALARS = {'true', 'false', 'yes', 'no', 'on', 'off', 'null', 'y', 'n'}
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class ValueLimits:
+    """Limits applied when rendering role default values."""
+
+    # Most items rendered for each list or dictionary
+    max_items: int = 50
+
+    # Deepest nesting of lists and dictionaries rendered
+    max_depth: int = 5
+
+    # Most characters rendered for a single value
+    max_chars: int = 2000
+
+    # Where the full value can be found, relative to the README
+    link: str = 'defaults/main.yml'
+
 
 def listify(value: typing.Union[typing.List, str]) -> str:
     """Turn a list of items into a Markdown formatted list."""
@@ -19,3 +47,105 @@ def quicklistify(value: typing.Dict[str, typing.Any]) -> str:
     for default in value:
         linked.append(f'[{default}](#{default})')
     return ', '.join(linked)
+
+
+def _scalar(value: typing.Any, max_chars: int) -> typing.Tuple[str, bool]:
+    """Format a scalar as YAML, returning whether it had to be cut."""
+    if isinstance(value, dict):
+        return '{}', False
+    if isinstance(value, list):
+        return '[]', False
+    if isinstance(value, bool):
+        return ('true' if value else 'false'), False
+    if value is None:
+        return 'null', False
+    if isinstance(value, (int, float)):
+        return repr(value), False
+
+    text = str(value)
+    truncated = len(text) > max_chars
+    text = text[:max_chars]
+
+    if PLAIN_SCALAR.fullmatch(text) and text.lower() not in RESERVED_SCALARS:
+        return text, truncated
+    return json.dumps(text, ensure_ascii=False), truncated
+
+
+def _yaml_lines(
+    value: typing.Union[typing.Dict, typing.List],
+    indent: str,
+    depth: int,
+    limits: ValueLimits,
+) -> typing.Iterator[typing.Tuple[str, bool]]:
+    """Lazily format a list or dictionary as YAML block lines.
+
+    Each line comes with whether something was cut from it.
+    """
+    items = value.items() if isinstance(value, dict) else value
+
+    for index, item in enumerate(items):
+        if index == limits.max_items:
+            yield f'{indent}# ... {len(value) - index} more', True
+            return
+
+        if isinstance(value, dict):
+            key, child = item
+            prefix = '{}{}:'.format(indent, _scalar(key, limits.max_chars)[0])
+        else:
+            child = item
+            prefix = f'{indent}-'
+
+        if not isinstance(child, (dict, list)) or not child:
+            text, truncated = _scalar(child, limits.max_chars)
+            yield f'{prefix} {text}', truncated
+        elif depth >= limits.max_depth:
+            yield '{} {}'.format(
+                prefix, '{...}' if isinstance(child, dict) else '[...]'
+            ), True
+        else:
+            yield prefix, False
+            yield from _yaml_lines(child, indent + '  ', depth + 1, limits)
+
+
+def yamlify(value: typing.Any, limits: ValueLimits = ValueLimits()) -> str:
+    """Turn a default value into bounded Markdown.
+
+    Scalars and flat lists are formatted like listify does, nested values
+    become YAML blocks. Output stops at the 'limits' and then links to the
+    full value instead.
+    """
+    if not isinstance(value, (dict, list)):
+        text = str(value)
+        truncated = len(text) > limits.max_chars
+        rendered = '``{}``'.format(text[: limits.max_chars])
+    elif isinstance(value, list) and not any(
+        isinstance(item, (dict, list))
+        for item in itertools.islice(value, limits.max_items)
+    ):
+        linked = []
+        truncated = len(value) > limits.max_items
+        for item in itertools.islice(value, limits.max_items):
+            text = str(item)
+            truncated = truncated or len(text) > limits.max_chars
+            linked.append('  * ``{}``'.format(text[: limits.max_chars]))
+        rendered = '\n{}'.format('\n'.join(linked))
+    else:
+        lines, chars, truncated = [], 0, False
+        for line, cut in _yaml_lines(value, '  ', 1, limits):
+            chars += len(line) + 1
+            if chars > limits.max_chars:
+                lines.append('  # ...')
+                truncated = True
+                break
+            lines.append(line)
+            truncated = truncated or cut
+        rendered = '\n\n  ```yaml\n{}\n  ```'.format('\n'.join(lines))
+
+    if truncated:
+        note = '  * *truncated*: see [{0}]({0}) for the full value'.format(
+            limits.link
+        )
+        separator = '\n\n' if rendered.endswith('```') else '\n'
+        rendered += separator + note
+
+    return rendered
@@ -0,0 +1,121 @@
+"""Role documentation linting module.
+
+Checks run against the role documentation gathered by AnsibleReadme, so
+linting alongside generation does not parse any role file twice.
+"""
+
+import typing
+
+import attr
+
+# Help text placed in docs/main.yml by the init command
+PLACEHOLDER_HELP = 'TODO.'
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class Problem:
+    """A single documentation problem found in a role."""
+
+    # Short identifier of the check which failed
+    rule: str
+
+    # Human readable explanation
+    message: str
+
+    # Role default the problem is about, if any
+    variable: typing.Optional[str] = None
+
+
+def lint_defaults(
+    role_doc: typing.Dict[str, typing.Any]
+) -> typing.List[Problem]:
+    """Check that every default has real help text and no docs are stale."""
+    problems = []
+    defaults = role_doc['defaults'] or {}
+    documented = role_doc['docs'].get('defaults') or {}
+
+    if not isinstance(documented, dict):
+        return [
+            Problem(
+                rule='invalid-docs',
+                message='defaults in docs/main.yml is not a mapping',
+            )
+        ]
+
+    for default in defaults:
+        if default not in documented:
+            problems.append(
+                Problem(
+                    rule='undocumented-default',
+                    message=f'{default} is not documented in docs/main.yml',
+                    variable=str(default),
+                )
+            )
+            continue
+
+        doc = documented[default]
+        help_text = doc.get('help') if isinstance(doc, dict) else None
+        if not help_text or str(help_text).strip() == PLACEHOLDER_HELP:
+            problems.append(
+                Problem(
+                    rule='missing-help',
+                    message=f'{default} has no help text in docs/main.yml',
+                    variable=str(default),
+                )
+            )
+
+    for default in documented:
+        if default not in defaults:
+            problems.append(
+                Problem(
+                    rule='stale-doc',
+                    message=(
+                        f'{default} is documented in docs/main.yml '
+                        'but is not in defaults/main.yml'
+                    ),
+                    variable=str(default),
+                )
+            )
+
+    return problems
+
+
+def lint_meta(role_doc: typing.Dict[str, typing.Any]) -> typing.List[Problem]:
+    """Check that meta/main.yml has a description and license."""
+    problems = []
+    galaxy_info = role_doc['meta'].get('galaxy_info') or {}
+
+    if not isinstance(galaxy_info, dict):
+        return [
+            Problem(
+                rule='invalid-meta',
+                message='galaxy_info in meta/main.yml is not a mapping',
+            )
+        ]
+
+    for field in ('description', 'license'):
+        if not galaxy_info.get(field):
+            problems.append(
+                Problem(
+                    rule=f'missing-{field}',
+                    message=f'meta/main.yml has no galaxy_info.{field}',
+                )
+            )
+
+    return problems
+
+
+def lint_role(role_doc: typing.Dict[str, typing.Any]) -> typing.List[Problem]:
+    """Run all checks against gathered role documentation."""
+    problems = [
+        Problem(
+            rule=f'invalid-{name}',
+            message=f'{name}/main.yml is not a mapping',
+        )
+        for name in ('defaults', 'docs', 'meta')
+        if not isinstance(role_doc[name], dict)
+    ]
+    if problems:
+        return problems
+
+    return lint_defaults(role_doc) + lint_meta(role_doc)
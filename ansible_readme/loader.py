@@ -0,0 +1,124 @@
+"""Resource bounded YAML loading module.
+
+Role files are loaded with a SafeLoader which keeps track of how big, how deep
+and how slow the document being composed is and bails out as soon as any of
+the configured limits are crossed. This stops "billion laughs" alias
+structures and huge generated files from exhausting shared CI runners.
+"""
+
+import os
+import pathlib
+import time
+import typing
+
+import attr
+import yaml
+
+
+class LimitExceededError(yaml.YAMLError):
+    """A YAML file went over one of the configured loading limits."""
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class LoadLimits:
+    """Limits applied when loading a single YAML file."""
+
+    # Largest file size (in bytes) that will be read at all
+    max_file_size: int = 10 * 1024 * 1024
+
+    # Most nodes which may be pulled in through aliases
+    max_alias_expansions: int = 10000
+
+    # Deepest nesting of mappings and sequences
+    max_depth: int = 100
+
+    # Longest time (in seconds) that parsing a single file may take
+    max_parse_time: float = 10.0
+
+
+class LimitedSafeLoader(yaml.SafeLoader):
+    """A SafeLoader which enforces LoadLimits while composing."""
+
+    def __init__(self, stream: typing.IO, path: str, limits: LoadLimits):
+        super().__init__(stream)
+        self.path = path
+        self.limits = limits
+        self.depth = 0
+        self.expansions = 0
+        self.weights: typing.Dict[int, int] = {}
+        self.deadline = time.monotonic() + limits.max_parse_time
+
+    def limit_exceeded(self, msg: str) -> LimitExceededError:
+        return LimitExceededError(f'{self.path}: {msg}')
+
+    def weigh(self, node: yaml.Node) -> int:
+        """Count all nodes reachable from 'node' (memoised)."""
+        if id(node) in self.weights:
+            return self.weights[id(node)]
+
+        # Guard against recursive anchors while the total is computed
+        self.weights[id(node)] = 1
+
+        weight = 1
+        if isinstance(node, yaml.SequenceNode):
+            weight += sum(self.weigh(item) for item in node.value)
+        elif isinstance(node, yaml.MappingNode):
+            weight += sum(
+                self.weigh(key) + self.weigh(value) for key, value in node.value
+            )
+
+        self.weights[id(node)] = weight
+        return weight
+
+    def compose_node(self, parent, index):
+        if time.monotonic() > self.deadline:
+            raise self.limit_exceeded(
+                'parsing took longer than {}s'.format(
+                    self.limits.max_parse_time
+                )
+            )
+
+        if self.check_event(yaml.AliasEvent):
+            anchor = self.peek_event().anchor
+            if anchor in self.anchors:
+                self.expansions += self.weigh(self.anchors[anchor])
+                if self.expansions > self.limits.max_alias_expansions:
+                    raise self.limit_exceeded(
+                        'aliases expand to more than {} nodes'.format(
+                            self.limits.max_alias_expansions
+                        )
+                    )
+            return super().compose_node(parent, index)
+
+        self.depth += 1
+        try:
+            if self.depth > self.limits.max_depth:
+                raise self.limit_exceeded(
+                    'nesting is deeper than {} levels'.format(
+                        self.limits.max_depth
+                    )
+                )
+            return super().compose_node(parent, index)
+        finally:
+            self.depth -= 1
+
+
+def load_yaml(path: pathlib.Path, limits: LoadLimits) -> typing.Any:
+    """Load the YAML file at 'path' within 'limits'."""
+    size = os.path.getsize(path)
+    if size > limits.max_file_size:
+        raise LimitExceededError(
+            f'{path}: file is {size} bytes, '
+            f'more than the {limits.max_file_size} bytes allowed'
+        )
+
+    with open(path) as file:
+        loader = LimitedSafeLoader(file, str(path), limits)
+        try:
+            return loader.get_single_data()
+        except RecursionError:
+            # Composing recurses, so a generous max_depth can still run out
+            # of interpreter stack before the depth limit is reached
+            raise loader.limit_exceeded('nesting is too deep to load') from None
+        finally:
+            loader.dispose()
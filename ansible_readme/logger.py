@@ -3,6 +3,7 @@
 This code is largely borrowed from the Ansible Molecule logger module.
 """
 
+import contextlib
 import logging
 import os
 import sys
@@ -77,6 +78,19 @@ def get_logger(name=None):
     return logger
 
 
+@contextlib.contextmanager
+def errors_only(enabled=True):
+    """Only let error (and success) records through while enabled."""
+    previous = logging.root.manager.disable
+    if enabled:
+        logging.disable(logging.WARNING)
+
+    try:
+        yield
+    finally:
+        logging.disable(previous)
+
+
 def _get_info_handler():
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(logging.INFO)
@@ -1,12 +1,29 @@
 """Unit tests against the AnsibleReadme module."""
 
+import concurrent.futures
+import io
+import json
+import logging
 import os
 import shutil
+import tarfile
+import time
+import zipfile
 
 import click
 import pytest
+from click.testing import CliRunner
 
-from ansible_readme import AnsibleReadme
+from ansible_readme import AnsibleReadme, __main__, api
+from ansible_readme.ansible_readme import (
+    generate_roots,
+    lint_roots,
+    load_roots,
+    shard_of,
+)
+from ansible_readme.cache import ReadmeCache
+from ansible_readme.filters import ValueLimits
+from ansible_readme.loader import LoadLimits
 
 
 def _inject_defaults(path, defaults):
@@ -206,3 +223,502 @@ def test_render_readme(single_role_path):
     ansible_readme.render_readmes()
 
     assert 'role1' in ansible_readme.role_readmes['role1']
+
+
+def test_write_archive_tar(many_roles_path, tmp_path_factory):
+    output = tmp_path_factory.mktemp('output') / 'readmes.tar.gz'
+    ansible_readme = AnsibleReadme(many_roles_path, output=str(output))
+
+    ansible_readme.gather_all()
+    ansible_readme.render_readmes()
+    ansible_readme.write_archive()
+
+    with tarfile.open(output) as archive:
+        assert sorted(archive.getnames()) == [
+            'role1/README.md',
+            'role2/README.md',
+            'role3/README.md',
+        ]
+        readme = archive.extractfile('role1/README.md')
+        assert readme.read().decode() == ansible_readme.role_readmes['role1']
+
+    assert not os.path.exists(many_roles_path / 'role1' / 'README.md')
+
+
+def test_write_archive_zip(single_role_path, tmp_path_factory):
+    output = tmp_path_factory.mktemp('output') / 'readmes.zip'
+    ansible_readme = AnsibleReadme(single_role_path, output=str(output))
+
+    ansible_readme.gather_all()
+    ansible_readme.render_readmes()
+    ansible_readme.write_archive()
+
+    with zipfile.ZipFile(output) as archive:
+        assert archive.namelist() == ['role1/README.md']
+
+
+@pytest.mark.parametrize('name', ['readmes.tar.gz', 'readmes.zip'])
+def test_write_archive_reproducible(
+    many_roles_path, tmp_path_factory, monkeypatch, name
+):
+    archives = []
+    for now in (1000000000, 1500000000):
+        monkeypatch.setattr(time, 'time', lambda: now)
+        output = tmp_path_factory.mktemp('output') / name
+        generate_roots([AnsibleReadme(many_roles_path, output=str(output))])
+        archives.append(output.read_bytes())
+
+    assert archives[0] == archives[1]
+
+
+def test_write_archive_placeholder_docs(single_role_path, tmp_path_factory):
+    output = tmp_path_factory.mktemp('output') / 'readmes.tar'
+    _inject_defaults(single_role_path, ['foo: bar'])
+
+    generate_roots([AnsibleReadme(single_role_path, output=str(output))])
+
+    # Undocumented roles are rendered without writing docs/ into the role
+    assert not os.path.exists(single_role_path / 'docs')
+    with tarfile.open(output) as archive:
+        readme = archive.extractfile('role1/README.md').read().decode()
+    assert '* *help*: TODO.' in readme
+
+
+def test_write_archive_unsupported(single_role_path):
+    with pytest.raises(click.ClickException) as exception:
+        AnsibleReadme(single_role_path, output='readmes.rar')
+    assert 'not a supported archive' in str(exception.value)
+
+
+def test_write_archive_stdout(many_roles_path):
+    runner = CliRunner()
+    result = runner.invoke(
+        __main__, ['generate', '--output', '-', str(many_roles_path)]
+    )
+    assert result.exit_code == 0
+
+    with tarfile.open(fileobj=io.BytesIO(result.stdout_bytes)) as archive:
+        assert len(archive.getnames()) == 3
+
+    # Logging is only silenced while the command runs
+    log = logging.getLogger('ansible_readme.ansible_readme')
+    assert logging.root.manager.disable == logging.NOTSET
+    assert log.level == logging.DEBUG
+
+
+def test_gather_all_alias_bomb_skips_role(many_roles_path):
+    limits = LoadLimits(max_alias_expansions=100)
+    ansible_readme = AnsibleReadme(many_roles_path, limits=limits)
+
+    bomb = ['a: &a ["lol", "lol", "lol", "lol", "lol"]']
+    for index, name in enumerate('bcdef'):
+        previous = 'abcde'[index]
+        bomb.append(f'{name}: &{name} [*{previous}, *{previous}, *{previous}]')
+    _inject_defaults(many_roles_path / 'role2', bomb)
+    _inject_defaults(many_roles_path / 'role3', ['foobar: barfoo'])
+    ansible_readme.gather_all()
+
+    assert 'role2' not in ansible_readme.role_docs
+    assert 'more than 100 nodes' in ansible_readme.role_errors['role2']
+    assert ansible_readme.role_docs['role3']['defaults'] == {'foobar': 'barfoo'}
+
+    with pytest.raises(click.ClickException) as exception:
+        ansible_readme.report_errors()
+    assert 'role2' in str(exception.value)
+
+
+def test_gather_all_file_size_limit(single_role_path):
+    limits = LoadLimits(max_file_size=10)
+    ansible_readme = AnsibleReadme(single_role_path, limits=limits)
+
+    _inject_defaults(single_role_path, ['foobar: barfoo'])
+    ansible_readme.gather_all()
+
+    assert 'bytes allowed' in ansible_readme.role_errors['role1']
+
+
+def test_gather_all_depth_limit(single_role_path):
+    limits = LoadLimits(max_depth=3)
+    ansible_readme = AnsibleReadme(single_role_path, limits=limits)
+
+    _inject_defaults(single_role_path, ['foobar: [[[[barfoo]]]]'])
+    ansible_readme.gather_all()
+
+    assert 'deeper than 3' in ansible_readme.role_errors['role1']
+
+
+def test_gather_all_recursion_limit(many_roles_path):
+    limits = LoadLimits(max_depth=100000)
+    ansible_readme = AnsibleReadme(many_roles_path, limits=limits)
+
+    _inject_defaults(
+        many_roles_path / 'role1', ['foobar: ' + '[' * 5000 + ']' * 5000]
+    )
+    ansible_readme.gather_all()
+
+    assert 'too deep' in ansible_readme.role_errors['role1']
+    assert sorted(ansible_readme.role_docs) == ['role2', 'role3']
+
+
+def test_render_readme_cache(single_role_path, tmp_path_factory):
+    cache_dir = tmp_path_factory.mktemp('cache')
+    ansible_readme = AnsibleReadme(single_role_path, cache_dir=cache_dir)
+
+    ansible_readme.gather_all()
+    ansible_readme.render_readmes()
+
+    cache = ReadmeCache(cache_dir)
+    assert len(cache.entries()) == 1
+    (entry, _), = cache.entries()
+    entry.write_text('cached')
+
+    ansible_readme.render_readmes()
+    assert ansible_readme.role_readmes['role1'] == 'cached'
+
+    _inject_defaults(single_role_path, ['foobar: barfoo'])
+    ansible_readme.gather_all()
+    ansible_readme.render_readmes()
+    assert ansible_readme.role_readmes['role1'] != 'cached'
+    assert len(cache.entries()) == 2
+
+
+def test_generate_roots_cache_skips_gathering(
+    many_roles_path, tmp_path_factory, monkeypatch
+):
+    cache_dir = tmp_path_factory.mktemp('cache')
+    generate_roots([AnsibleReadme(many_roles_path, cache_dir=cache_dir)])
+    readme = (many_roles_path / 'role1' / 'README.md').read_text()
+
+    def gather_role(self, path):
+        raise AssertionError(f'{path} was gathered')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(AnsibleReadme, 'gather_role', gather_role)
+        ansible_readme = AnsibleReadme(many_roles_path, cache_dir=cache_dir)
+        generate_roots([ansible_readme])
+
+    assert ansible_readme.role_readmes['role1'] == readme
+    assert not ansible_readme.role_docs
+
+    # Linting needs the gathered docs, so cache hits are still gathered
+    ansible_readme = AnsibleReadme(many_roles_path, cache_dir=cache_dir)
+    report = generate_roots([ansible_readme], lint=True)
+    assert sorted(ansible_readme.role_docs) == ['role1', 'role2', 'role3']
+    assert len(report['roles']) == 3
+
+
+def test_readme_cache_gc(tmp_path):
+    cache = ReadmeCache(tmp_path)
+    for key in ['aa11', 'bb22', 'cc33']:
+        cache.put(key, 'x' * 10)
+    os.utime(cache.entry_path('aa11'), (0, 0))
+
+    assert cache.gc(max_age=60 * 60) == (1, 10)
+    assert not os.path.exists(cache.entry_path('aa11'))
+
+    assert cache.gc(max_size=10) == (1, 10)
+    assert len(cache.entries()) == 1
+
+
+def test_api_generate(many_roles_path, tmp_path_factory):
+    no_roles_path = tmp_path_factory.mktemp('empty')
+    (many_roles_path / 'role2' / 'README.md').write_text('hand written')
+
+    results = api.generate([many_roles_path, no_roles_path], jobs=2)
+    statuses = {result.path.name: result.status for result in results}
+
+    assert statuses == {
+        no_roles_path.name: api.ERROR,
+        'role1': api.WRITTEN,
+        'role2': api.ERROR,
+        'role3': api.WRITTEN,
+    }
+    assert os.path.exists(many_roles_path / 'role1' / 'docs' / 'main.yml')
+
+    results = api.generate([many_roles_path])
+    statuses = {result.path.name: result.status for result in results}
+    assert statuses['role1'] == api.UNCHANGED
+
+
+def test_api_generate_malformed_role(many_roles_path):
+    (many_roles_path / 'role2' / 'meta' / 'main.yml').write_text('[foo]')
+    (many_roles_path / 'role3' / 'defaults' / 'main.yml').write_bytes(b'\xff')
+
+    results = api.generate([many_roles_path])
+    statuses = {result.path.name: result.status for result in results}
+
+    assert statuses == {
+        'role1': api.WRITTEN,
+        'role2': api.ERROR,
+        'role3': api.ERROR,
+    }
+
+
+def test_init_docs_without_context(single_role_path):
+    ansible_readme = AnsibleReadme(single_role_path, command='init')
+    ansible_readme.init_docs()
+
+    assert os.path.exists(single_role_path / 'docs' / 'main.yml')
+
+
+def test_load_roots_dedupes_roles(many_roles_path, tmp_path_factory):
+    vendor_path = tmp_path_factory.mktemp('vendor')
+    os.symlink(many_roles_path / 'role1', vendor_path / 'role1')
+    os.symlink(many_roles_path / 'role2', vendor_path / 'linked')
+
+    ansible_readmes = load_roots(
+        [many_roles_path, vendor_path, many_roles_path / 'role3']
+    )
+
+    assert len(ansible_readmes) == 3
+    assert sorted(ansible_readmes[0].role_paths) == [
+        many_roles_path / 'role1',
+        many_roles_path / 'role2',
+        many_roles_path / 'role3',
+    ]
+    assert ansible_readmes[1].role_paths == []
+    assert ansible_readmes[2].role_paths == []
+    assert ansible_readmes[0].environment is ansible_readmes[1].environment
+
+
+def test_write_archive_many_roots(many_roles_path, tmp_path_factory):
+    output = tmp_path_factory.mktemp('output') / 'readmes.tar'
+    ansible_readmes = load_roots(
+        [many_roles_path / 'role1', many_roles_path / 'role2'],
+        output=str(output),
+    )
+
+    generate_roots(ansible_readmes)
+
+    with tarfile.open(output) as archive:
+        assert sorted(archive.getnames()) == [
+            'role1/README.md',
+            'role2/README.md',
+        ]
+
+
+def test_roles_path_shards_partition_roles(many_roles_path):
+    sharded = [
+        AnsibleReadme(many_roles_path, shard=(index, 2)).role_paths
+        for index in (1, 2)
+    ]
+
+    assert not set(sharded[0]) & set(sharded[1])
+    assert sorted(sharded[0] + sharded[1]) == sorted(
+        AnsibleReadme(many_roles_path).role_paths
+    )
+
+    # Assignments only depend on the role path relative to its root
+    assert shard_of(many_roles_path / 'role1', many_roles_path, 3) == 3
+    assert shard_of(many_roles_path / 'role2', many_roles_path, 3) == 2
+
+
+def test_roles_path_shards_are_stable(many_roles_path):
+    before = {
+        path.name: index
+        for index in (1, 2, 3)
+        for path in AnsibleReadme(many_roles_path, shard=(index, 3)).role_paths
+    }
+
+    new_role_path = many_roles_path / 'role4'
+    shutil.copytree(many_roles_path / 'role1', new_role_path)
+
+    after = {
+        path.name: index
+        for index in (1, 2, 3)
+        for path in AnsibleReadme(many_roles_path, shard=(index, 3)).role_paths
+    }
+
+    assert sorted(after) == ['role1', 'role2', 'role3', 'role4']
+    assert {name: after[name] for name in before} == before
+
+
+def test_load_roots_shards_after_deduping(many_roles_path, tmp_path_factory):
+    vendor_path = tmp_path_factory.mktemp('vendor')
+    (vendor_path / 'linked').symlink_to(many_roles_path / 'role1')
+
+    for count in (3, 4, 5):
+        role_paths = [
+            role_path
+            for index in range(1, count + 1)
+            for ansible_readme in load_roots(
+                [many_roles_path, vendor_path], shard=(index, count)
+            )
+            for role_path in ansible_readme.role_paths
+        ]
+
+        # The symlinked duplicate never lands in a shard of its own
+        assert sorted(path.name for path in role_paths) == [
+            'role1',
+            'role2',
+            'role3',
+        ]
+
+
+def test_roles_path_invalid_shard(many_roles_path):
+    with pytest.raises(click.ClickException) as exception:
+        AnsibleReadme(many_roles_path, shard=(3, 2))
+    assert 'between' in str(exception.value)
+
+
+def test_render_readme_fragments_keep_types(many_roles_path):
+    for role, port in (('role1', '80'), ('role2', "'80'")):
+        docs = many_roles_path / role / 'docs'
+        docs.mkdir()
+        (docs / 'main.yml').write_text('defaults: {ports: {help: Ports}}')
+        _inject_defaults(many_roles_path / role, [f'ports: {{{port}: http}}'])
+
+    ansible_readme = AnsibleReadme(many_roles_path)
+    ansible_readme.gather_all()
+    readmes = ansible_readme.render_readmes()
+
+    assert '  80: http' in readmes['role1']
+    assert '  "80": http' in readmes['role2']
+
+
+def test_render_readme_bounded_defaults(single_role_path):
+    limits = ValueLimits(max_items=2, max_depth=2, max_chars=200)
+    ansible_readme = AnsibleReadme(single_role_path, value_limits=limits)
+    docs = single_role_path / 'docs'
+    docs.mkdir()
+
+    _inject_defaults(
+        single_role_path,
+        [
+            'flat: [a, b]',
+            'nested: {a: {b: {c: d}}}',
+            'huge: [' + ', '.join(['x'] * 1000) + ']',
+        ],
+    )
+    (docs / 'main.yml').write_text(
+        'defaults: {flat: {help: F}, nested: {help: N}, huge: {help: H}}'
+    )
+    ansible_readme.gather_all()
+    readme = ansible_readme.render_readmes()['role1']
+
+    assert '* *default*: \n  * ``a``\n  * ``b``\n' in readme
+    assert '  ```yaml\n  a:\n    b: {...}\n  ```' in readme
+    assert readme.count('``x``') == 2
+    assert readme.count('see [defaults/main.yml](defaults/main.yml)') == 2
+
+
+def test_lint_roles(single_role_path):
+    ansible_readme = AnsibleReadme(single_role_path)
+    docs = single_role_path / 'docs'
+    docs.mkdir()
+
+    _inject_defaults(single_role_path, ['good: 1', 'todo: 2', 'missing: 3'])
+    _inject_meta(single_role_path, ['galaxy_info: {description: Role}'])
+    (docs / 'main.yml').write_text(
+        'defaults: {good: {help: Good}, todo: {help: TODO.}, stale: {}}'
+    )
+
+    problems = ansible_readme.lint_roles(jobs=2)[single_role_path]
+
+    assert sorted((problem.rule, problem.variable) for problem in problems) == [
+        ('missing-help', 'todo'),
+        ('missing-license', None),
+        ('stale-doc', 'stale'),
+        ('undocumented-default', 'missing'),
+    ]
+
+
+def test_lint_roots_reuses_gathered_docs(many_roles_path):
+    ansible_readmes = load_roots([many_roles_path])
+    ansible_readmes[0].gather_all()
+    ansible_readmes[0].role_docs['role1']['meta']['galaxy_info'] = {
+        'description': 'Role',
+        'license': 'GPLv3',
+    }
+    _inject_defaults(many_roles_path / 'role2', ['foo: [bar'])
+
+    report = lint_roots(ansible_readmes)
+    problems = {
+        role['role']: [problem['rule'] for problem in role['problems']]
+        for role in report['roles']
+    }
+
+    assert problems['role1'] == []
+    assert problems['role2'] == ['missing-description', 'missing-license']
+    assert report['problem_count'] == 4
+
+
+def test_lint_roots_shares_one_pool(
+    many_roles_path, tmp_path_factory, monkeypatch
+):
+    other_path = tmp_path_factory.mktemp('other')
+    shutil.copytree(many_roles_path / 'role1', other_path / 'role4')
+    _inject_defaults(other_path / 'role4', ['foo: [bar'])
+
+    pools = []
+    executor = concurrent.futures.ProcessPoolExecutor
+
+    def recording_executor(*args, **kwargs):
+        pools.append(kwargs)
+        return executor(*args, **kwargs)
+
+    monkeypatch.setattr(
+        concurrent.futures, 'ProcessPoolExecutor', recording_executor
+    )
+
+    report = lint_roots(load_roots([many_roles_path, other_path]), jobs=2)
+    problems = {
+        role['role']: [problem['rule'] for problem in role['problems']]
+        for role in report['roles']
+    }
+
+    assert len(pools) == 1
+    assert pools[0]['max_workers'] == 2
+    assert problems['role4'] == ['load-error']
+
+
+def test_lint_invalid_role_files(many_roles_path):
+    docs = many_roles_path / 'role1' / 'docs'
+    docs.mkdir()
+    (docs / 'main.yml').write_text('[foo, bar]')
+    (many_roles_path / 'role2' / 'meta' / 'main.yml').write_text('[foo]')
+    _inject_meta(many_roles_path / 'role3', ['galaxy_info: [foo]'])
+
+    runner = CliRunner()
+    result = runner.invoke(__main__, ['lint', str(many_roles_path)])
+    assert result.exit_code == 1
+
+    report = json.loads(result.stdout)
+    assert [role['role'] for role in report['roles']] == [
+        'role1',
+        'role2',
+        'role3',
+    ]
+    assert [
+        [problem['rule'] for problem in role['problems']]
+        for role in report['roles']
+    ] == [['invalid-docs'], ['invalid-meta'], ['invalid-meta']]
+
+    # Logging is only silenced while the command runs
+    log = logging.getLogger('ansible_readme.ansible_readme')
+    assert logging.root.manager.disable == logging.NOTSET
+    assert log.level == logging.DEBUG
+
+
+def test_generate_render_error(many_roles_path):
+    (many_roles_path / 'role2' / 'meta' / 'main.yml').write_text('[foo]')
+    runner = CliRunner()
+
+    result = runner.invoke(
+        __main__, ['generate', '--lint', str(many_roles_path)]
+    )
+    assert result.exit_code == 1
+    report = json.loads(result.stdout)
+    problems = {
+        role['role']: [problem['rule'] for problem in role['problems']]
+        for role in report['roles']
+    }
+    assert problems['role2'] == ['invalid-meta', 'render-error']
+    assert 'render-error' not in problems['role1']
+
+    result = runner.invoke(
+        __main__, ['generate', '--force', str(many_roles_path)]
+    )
+    assert result.exit_code == 1
+    assert 'Failed to process 1 role(s): role2' in result.output
+    assert os.path.exists(many_roles_path / 'role1' / 'README.md')